@@ -12,11 +12,9 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      CODE LAYER:     Layer #4 (Topmost layer of program.)                   |
-#|      IMPORTS:        (3) deviceType;                                        |
-#|                      (2) stateSet;                                          |
-#|                      (1) symmetryGroup;                                     |
-#|                      (0) utilities.                                         |
+#|      CODE LAYER:     Layer #3 (Topmost layer of program.)                   |
+#|      IMPORTS:        (2) deviceType, stateSet;                              |
+#|                      (0) symmetryGroup, utilities.                          |
 #|                                                                             |
 #|                                                                             |
 #|      FILE HISTORY:                                                          |
@@ -117,12 +115,12 @@ from    time        import  process_time    as proctime
 # Imports from code layer #0:
 
 from    utilities   import  (   # Miscellaneous utility functions.
-            assignID,   # Assigns a unique ID to a hashable object.
+            assignIDs,  # Assigns consecutive unique IDs to hashable objects.
             count       # Counts the items produced by an iterable.
         )
 
 
-# Imports from code layer #1:
+# (Also from code layer #0:)
 
     #---------------------------------------------------------------------------
     #   The symmetryGroup module is important for defining the composite group G
@@ -186,7 +184,7 @@ from    stateSet       import (
         )
 
 
-# Imports from code layer #3:
+# (Also from code layer #2:)
 
     #---------------------------------------------------------------------------
     #   NOTE: The deviceType module defines various general types of BARC devi-
@@ -382,6 +380,12 @@ def enumerateSymmetryGroups(devFuncList, symmetryTransforms):
     #print('\t', deviceFunctions)
     
     knownSymmetryGroups = []     # No symmetry groups are known initially.
+
+        # Maps each device function in any known symmetry group to that
+        # group. Since the groups are orbits, they never overlap, so this
+        # lets us find a function's group (if any) with one dict lookup,
+        # instead of asking each known group in turn whether it has it.
+    groupOf = dict()
     
     # The index variable i is just used to count the raw device functions studied.
     i = 0
@@ -395,12 +399,7 @@ def enumerateSymmetryGroups(devFuncList, symmetryTransforms):
             # First, let's check whether this function's symmetry group
             # has already been found.
     
-        alreadyKnown = False
-        for knownSymmetryGroup in knownSymmetryGroups:
-            if knownSymmetryGroup.contains(deviceFunction):
-                # This function's group has already been identified.
-                alreadyKnown = True     
-                break
+        alreadyKnown = deviceFunction in groupOf
         
         if alreadyKnown:
             print("    It's already in a known symmetry group.")
@@ -432,6 +431,9 @@ def enumerateSymmetryGroups(devFuncList, symmetryTransforms):
             
             knownSymmetryGroups += [newSymmetryGroup]
 
+            for member in newSymmetryGroup.uniqueElements():
+                groupOf[member] = newSymmetryGroup
+
         #__/ End if alreadyKnown... else...
 
     #__/ End loop over device functions.
@@ -545,13 +547,8 @@ def characterizeDeviceFunctions(nTerminals, conserveFlux=True):
         # Convert the generator to a list. (Potentially slow part.)
     devFuncList = list(deviceFunctions(conserveFlux))
 
-    # The following assigns numeric IDs to the device functions found.
-    #print("\nThe device functions are:\n")
-    i=1
-    for devFunc in devFuncList:
-        #print(f"Device #{i} is: {str(devFunc)}")
-        assignID(devFunc,i)
-        i += 1
+    # The following assigns numeric IDs 1, 2, 3, ... to the device functions found.
+    assignIDs(devFuncList, 1)
 
         # This enumerates all of the possible distinct fully-
         # reversible functional behaviors for devices of the 
@@ -668,12 +665,15 @@ def characterizeDeviceFunctions(nTerminals, conserveFlux=True):
         size = group.cardinality()
         print('-'*50)
         print(f"Symmetry group #{groupNum} has {size} functions:")
-        for func in group.uniqueElements():
+            # List the members in order of ID, so that the report doesn't
+            # depend on the (hash-based) iteration order of the group's
+            # unique elements.
+        members = sorted(group.uniqueElements(), key=lambda func: func.ID())
+        for func in members:
             print(f"\tFunction #{func.ID()}.")
-        for func in group.uniqueElements():
-            print(f"\nExample: Function #{func.ID()} = " + str(func))
-            func.showSymmetries()
-            break   # Stop after first function.
+        func = members[0]   # The lowest-numbered member represents the group.
+        print(f"\nExample: Function #{func.ID()} = " + str(func))
+        func.showSymmetries()
 
 
 def tryAllSizes():
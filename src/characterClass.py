@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
+#|      IMPORTED BY:    (2) deviceType.                                        |
 #|      CODE LAYER:     Layer #0 (no imports from custom modules).             |
 #|      IMPORTS:        (none)                                                 |
 #|                                                                             |
@@ -50,14 +50,31 @@ class CharacterClass:
     #|      .isUniform [bool]   - True if all ports' pulse-type
     #|                               alphabets are the same.
     #|
+    #|  Private instance attributes:
+    #|  ============================
+    #|
+    #|      ._sigCharTable [list] - Table of this class's signal char-
+    #|                              acters; entry [p][k] is the signal
+    #|                              character for port p with the k'th
+    #|                              pulse type of that port's alphabet,
+    #|                              or None if it hasn't been needed yet.
+    #|                              Filled in by SignalCharacter.of().
+    #|
     #\--------------------------------------------------------------------------
 
     # Private class variable.
     _isUniform = None       # Don't assume uniform by default.
 
+    # Public class variable; only meaningful for uniform classes.
+    isUnary = None
+
     def __init__(newCharacterClass, nPorts, pulseAlphabets):
     
         ncc = newCharacterClass
+
+        if len(pulseAlphabets) != nPorts:
+            raise ValueError(f"expected {nPorts} pulse alphabets (one per "
+                             f"port), got {len(pulseAlphabets)}")
     
         ncc.nPorts = nPorts
         ncc.pulseAlphabets = pulseAlphabets
@@ -70,11 +87,25 @@ class CharacterClass:
                     if alphabet != firstAlphabet:
                         ncc._isUniform = False
 
+            # Initially-empty table of signal characters (see above).
+        ncc._sigCharTable = [[None] * alphabet.arity
+                                for alphabet in pulseAlphabets]
+
     @property    
     def isUniform(thisCharClass):
         """Boolean; True iff all ports' pulse alphabets are the same."""
         return thisCharClass._isUniform
 
+    def _requireUniform(thisCharClass, operation):
+        """Raises a ValueError, saying that the given <operation> (a
+            description of a port permutation) can't be done, unless
+            all of this character class's ports have the same alphabet.
+            (Port permutations only make sense in that case.)"""
+        if not thisCharClass._isUniform:
+            raise ValueError(f"can't {operation}: the ports of this "
+                             f"character class have different pulse "
+                             f"alphabets")
+
 class UniformCharacterClass(CharacterClass):
     """A class for classes of signal characters in which the pulse 
         type alphabet does not vary by port (i.e., it is the same 
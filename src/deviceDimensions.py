@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
+#|      IMPORTED BY:    (2) deviceType.                                        |
 #|      CODE LAYER:     Layer #0 (no imports from custom modules).             |
 #|      IMPORTS:        (none)                                                 |
 #|                                                                             |
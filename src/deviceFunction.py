@@ -11,10 +11,9 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
-#|      CODE LAYER:     Layer #2 (no cust. imports fr. above layer #1)         |
-#|      IMPORTS:        (1) transitionFunction;                                |
-#|                      (0) utilities.                                         |
+#|      IMPORTED BY:    (2) deviceType.                                        |
+#|      CODE LAYER:     Layer #1 (no cust. imports fr. above layer #0)         |
+#|      IMPORTS:        (0) transitionFunction, utilities.                     |
 #|                                                                             |
 #|-----------------------------------------------------------------------------|
 #|                                                                             |
@@ -51,9 +50,6 @@ __all__ = ['DeviceFunction']
 from utilities import lookupID
     # Looks up the unique ID# associated with a specifice device function.
 
-    #~~~~~~~~~~~~~~~~~~~~~~~~
-    # Imports from layer #1:
-
 from transitionFunction import TransitionFunction
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -78,6 +74,12 @@ class DeviceFunction:
         
         deviceFunction._transitionFunction = transitionFunction
 
+            # Device functions never change, so we can compute the hash
+            # code the first time it's asked for, and then just keep it.
+            # (It gets used a lot, since device functions are the keys of
+            # the device ID map, and the elements of symmetry groups.)
+        deviceFunction._hash = None
+
     def __eq__(thisDeviceFunction, otherDeviceFunction):
     
         """Returns True iff the two device functions are
@@ -94,7 +96,9 @@ class DeviceFunction:
     def __hash__(thisDeviceFunction):
         """Returns a consistent hash code for this device function."""
         tdf = thisDeviceFunction
-        return hash((tdf.type, tdf.transitionFunction))
+        if tdf._hash is None:
+            tdf._hash = hash((tdf._type, tdf._transitionFunction))
+        return tdf._hash
     
     def __str__(deviceFunction) -> str:
         """Human-readable string representation of this device function."""
@@ -246,5 +250,21 @@ class DeviceFunction:
         new_tf = df.transitionFunction.portRotate(offset)
         return DeviceFunction(df.type, new_tf)
 
+    def withPerm(deviceFunction, perm):
+        """Return the device function of the same type as this one whose
+            transition function is given by the permutation tuple <perm>
+            of syndrome indices. (See the transitionFunction module.)"""
+        df = deviceFunction
+        return DeviceFunction(df.type, TransitionFunction.fromPerm(df.type, perm))
+
+    def relabel(deviceFunction, relabeling, reverse=False):
+        """Return the device function that results from relabeling this
+            device function's syndrome indices by the given permutation,
+            and then (optionally) reversing it. (Used by composite 
+            symmetry transforms.)"""
+        df = deviceFunction
+        new_tf = df.transitionFunction.relabel(relabeling, reverse)
+        return DeviceFunction(df.type, new_tf)
+
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
@@ -11,13 +11,12 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (4) barc.                                              |
-#|      CODE LAYER:     Layer #3 (no imports from modules above layer #2).     |
-#|      IMPORTS:        (2) deviceFunction;                                    |
-#|                      (1) pulseAlphabet, pulseType, transitionFunction;      |
+#|      IMPORTED BY:    (3) barc.                                              |
+#|      CODE LAYER:     Layer #2 (no imports from modules above layer #1).     |
+#|      IMPORTS:        (1) deviceFunction, pulseAlphabet, pulseType;          |
 #|                      (0) characterClass, deviceDimensions, dictPermuter,    |
 #|                          signalCharacter, symmetryTransform, syndrome,      |
-#|                          utilities.                                         |
+#|                          transitionFunction, utilities.                     |
 #|                                                                             |
 #|      FILE HISTORY:                                                          |
 #|      =============                                                          |
@@ -106,6 +105,18 @@ __all__ = [
     #|  Module section 1. Imports.                          [code section]
     #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
+        #/~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        #| Imports from standard library modules.
+
+from types              import  MappingProxyType
+    # A read-only view of a dictionary.
+    #   [USED IN: DeviceType.identityIOMap().]
+
+from weakref            import  WeakValueDictionary
+    # A dictionary that doesn't keep its values alive.
+    #   [USED IN: DeviceType initializer.]
+
+
         #/~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #| Imports from code layer #0.
 
@@ -141,7 +152,8 @@ from    symmetryTransform   import (
             FluxNegationTransform,          # F negates all fluxes (I/O & state).
             StateNegationTransform,         # S negates/swaps just the states.
             PortExchangeTransform,          # E(p1,p2) exchanges two ports.
-            PortRotationTransform           # R(o) rotates the ports.
+            PortRotationTransform,          # R(o) rotates the ports.
+            IdentityTransform               # I leaves functions unchanged.
     ) # We need these constructors to create the transforms for this device.
 
 from syndrome           import  Syndrome             # [Class]
@@ -151,6 +163,12 @@ from syndrome           import  Syndrome             # [Class]
     # syndrome is not specified (it's assumed to be clear in context).
     #   [USED IN: DeviceType.syndromes() method.]
 
+from transitionFunction import TransitionFunction   # [Class]
+    # An object of class TransitionFunction specifies an I/O relation
+    # (map from input syndromes to output syndromes) for a given device
+    # type.
+    #   [USED IN: DeviceType.deviceFunctions() method.]
+
 from utilities          import  isOdd   
     # Returns True if its argument is an odd number
 
@@ -188,16 +206,6 @@ from pulseType          import PulseType
     # to construct PulseType objects when generating I/O syndromes.
     #   [USED IN: DeviceType.syndromes() method.]
 
-from transitionFunction import TransitionFunction   # [Class]
-    # An object of class TransitionFunction specifies an I/O relation
-    # (map from input syndromes to output syndromes) for a given device
-    # type.
-    #   [USED IN: DeviceType.deviceFunctions() method.]
-
-
-        #/~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        #| Imports from code layer #2.
-
 from deviceFunction     import DeviceFunction       # [Class]
     # An object of class DeviceFunction specifies both the device type
     # and exact transition function for a particular functional element
@@ -265,6 +273,44 @@ class DeviceType:
     #|              The stateSet object representing the set of internal 
     #|              states supported by this particular deviceType.
     #|
+    #|      ._syndromeIndex [dict] -
+    #|
+    #|              Maps each I/O syndrome of this device type to its
+    #|              index in the canonical order in which .syndromes()
+    #|              enumerates them. Transition functions are stored as
+    #|              permutations of these indices.
+    #|
+    #|      ._inputSyndromes, ._outputSyndromes [tuple] -
+    #|
+    #|              The I/O syndromes, in canonical order, as input and
+    #|              output syndromes respectively.
+    #|
+    #|      ._syndromePerms [dict] -
+    #|
+    #|              Cache of the permutations of syndrome indices that
+    #|              implement the symmetry transforms (see the methods
+    #|              .negFluxPerm(), .negStatePerm() and .portPermute-
+    #|              Perm()); filled in
+    #|              as they're needed.
+    #|
+    #|      ._transFuncs [WeakValueDictionary] -
+    #|
+    #|              Transition functions of this device type that are 
+    #|              currently in use, keyed by their permutation tuples.
+    #|              Filled in by TransitionFunction.fromPerm().
+    #|
+    #|      ._identityPerm [tuple], ._identityIOMap [MappingProxyType] -
+    #|
+    #|              The identity transition function's map, as a permu-
+    #|              tation of syndrome indices and (once it's been asked
+    #|              for) as a read-only I/O map; shared by all identity
+    #|              transition functions of this device type.
+    #|
+    #|      ._identityTransform [IdentityTransform] -
+    #|
+    #|              The identity symmetry transform for this device type
+    #|              (see .identityTransform()); created on first use.
+    #|
     #\~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def __init__(deviceType, pulseAlphabets, stateSet):
@@ -301,6 +347,17 @@ class DeviceType:
             charClass = CharacterClass(nTerminals, pulseAlphabets)
             deviceType._charClass       = charClass
 
+            # Fix a canonical indexing of this device type's I/O syndromes.
+        syndromes = tuple(deviceType.syndromes())
+        deviceType._syndromeIndex = {syn: i for (i, syn) in enumerate(syndromes)}
+        deviceType._inputSyndromes = tuple(syn.asInput() for syn in syndromes)
+        deviceType._outputSyndromes = tuple(syn.asOutput() for syn in syndromes)
+        deviceType._syndromePerms = dict()
+        deviceType._transFuncs = WeakValueDictionary()
+        deviceType._identityPerm = tuple(range(len(syndromes)))
+        deviceType._identityIOMap = None    # Built on first use.
+        deviceType._identityTransform = None    # Likewise.
+
     # Equivalence operator for device types. We declare two device types to be
     # equivalent iff both their state sets and pulse alphabets are equivalent.
 
@@ -343,6 +400,10 @@ class DeviceType:
         #|
         #|          The number of ports that devices of this type have.
         #|
+        #|      .nSyndromes [int] -
+        #|
+        #|          The number of distinct I/O syndromes for this type.
+        #|
         #|      .pulseAlphabets [iterable] -
         #|
         #|          An iterable of the pulse alphabets for the device's
@@ -376,6 +437,11 @@ class DeviceType:
         """This property gives the device's number of ports."""
         return deviceType.dimensions.nPorts
 
+    @property
+    def nSyndromes(deviceType) -> int:
+        """This property gives the number of distinct I/O syndromes."""
+        return len(deviceType._inputSyndromes)
+
     @property
     def pulseAlphabets(deviceType):
         """This property gives an iterable of the pulse alphabets
@@ -403,6 +469,13 @@ class DeviceType:
         #|          Returns the DirectionReversalTransform object (which
         #|          is conceptually an operator) for devices of this type.
         #|
+        #|      .identityTransform() [IdentityTransform] -
+        #|
+        #|          Returns the identity transform for devices of this
+        #|          type. (There is just one per device type; it is what
+        #|          compositions and powers of transforms reduce to when
+        #|          they cancel out.)
+        #|
         #|      .reportableTransforms() [iterator] -
         #|
         #|          This generator method returns an iterator that
@@ -421,6 +494,33 @@ class DeviceType:
         #|          distinguishing between input and output syndromes)
         #|          for this particular device type.
         #|
+        #|      .syndromeIndex(syndrome) [int] -
+        #|
+        #|          Returns the index of the given I/O syndrome in the
+        #|          canonical order given by .syndromes().
+        #|
+        #|      .inputSyndrome(index), .outputSyndrome(index) [Syndrome] -
+        #|
+        #|          Return the I/O syndrome with the given index, as an
+        #|          input syndrome or an output syndrome respectively.
+        #|
+        #|      .identityPerm() [tuple], .identityIOMap() [mapping] -
+        #|
+        #|          Return the map of the identity transition function
+        #|          of this type, as a permutation of syndrome indices,
+        #|          or as a read-only map from input to output syndromes.
+        #|
+        #|      .negFluxPerm(), .negStatePerm(),
+        #|      .portPermutePerm(portPerm) [tuple] -
+        #|
+        #|          Return the permutation of syndrome indices (as a tuple
+        #|          mapping each index to its new index) that corresponds
+        #|          to negating fluxes, negating states, or moving each
+        #|          port p to port portPerm[p] (which covers both port
+        #|          exchanges and port rotations), respectively. These are
+        #|          what transition functions use to implement the 
+        #|          symmetry transforms.
+        #|
         #\vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
     # Generates all device functions of this type.
@@ -559,9 +659,64 @@ class DeviceType:
             for symbol in pulseAlphabet.symbols:
                 pulseType = PulseType(pulseAlphabet, symbol)
                 for state in deviceType.stateSet:
-                    yield Syndrome(SignalCharacter(portIndex, pulseType,
-                                                    charClass), 
-                                    state)
+                    yield Syndrome.of(SignalCharacter.of(charClass, portIndex,
+                                                          pulseType),
+                                      state)
+
+    def syndromeIndex(deviceType, syndrome):
+        """Returns the canonical index of the given I/O syndrome."""
+        return deviceType._syndromeIndex[syndrome]
+
+    def inputSyndrome(deviceType, index):
+        """Returns the input syndrome with the given canonical index."""
+        return deviceType._inputSyndromes[index]
+
+    def outputSyndrome(deviceType, index):
+        """Returns the output syndrome with the given canonical index."""
+        return deviceType._outputSyndromes[index]
+
+    def identityPerm(deviceType):
+        """Returns the identity permutation of syndrome indices."""
+        return deviceType._identityPerm
+
+    def identityIOMap(deviceType):
+        """Returns (building it the first time) a read-only map from each
+            input syndrome to the same syndrome as an output syndrome."""
+        if deviceType._identityIOMap is None:
+            deviceType._identityIOMap = MappingProxyType(
+                dict(zip(deviceType._inputSyndromes,
+                         deviceType._outputSyndromes)))
+        return deviceType._identityIOMap
+
+    def _syndromePerm(deviceType, key, relabel):
+        """Returns (computing and caching it, the first time) the 
+            permutation of syndrome indices induced by applying the
+            function <relabel> to each syndrome. The <key> identifies
+            the permutation in the cache."""
+        perms = deviceType._syndromePerms
+        perm = perms.get(key)
+        if perm is None:
+            index = deviceType._syndromeIndex
+            perm = tuple(index[relabel(syn)] for syn in deviceType._inputSyndromes)
+            perms[key] = perm
+        return perm
+
+    def negFluxPerm(deviceType):
+        """Returns the relabeling of syndrome indices that negates every
+            syndrome's flux (its pulse type and, if negatable, its state)."""
+        return deviceType._syndromePerm('F', lambda syn: syn.negFlux())
+
+    def negStatePerm(deviceType):
+        """Returns the relabeling of syndrome indices that negates just
+            every syndrome's internal state."""
+        return deviceType._syndromePerm('S', lambda syn: syn.negState())
+
+    def portPermutePerm(deviceType, portPerm):
+        """Returns the relabeling of syndrome indices that moves each
+            syndrome on port p to port portPerm[p] (<portPerm> is a tuple
+            of port indices), leaving its pulse type and state alone."""
+        return deviceType._syndromePerm(('P', portPerm),
+                                        lambda syn: syn.portPermute(portPerm))
 
     # The methods below construct and return transforms that are defined
     # for all device types. (We could have made these properties instead
@@ -575,6 +730,16 @@ class DeviceType:
 
         return DirectionReversalTransform(deviceType)
 
+    def identityTransform(deviceType):
+
+        """Returns the identity (I) transform for this device type, which
+            leaves every transition function unchanged. This is created 
+            just once, so it can be recognized by identity ("is")."""
+
+        if deviceType._identityTransform is None:
+            deviceType._identityTransform = IdentityTransform(deviceType)
+        return deviceType._identityTransform
+
     def stateNegationTransform(deviceType):
 
         """Returns the state-negation (S) transform for this device type.
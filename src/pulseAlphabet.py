@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
+#|      IMPORTED BY:    (2) deviceType.                                        |
 #|      CODE LAYER:     Layer #1 (no custom imports from above layer #0)       |
 #|      IMPORTS:        (0) utilities.                                         |
 #|
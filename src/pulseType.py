@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
+#|      IMPORTED BY:    (2) deviceType.                                        |
 #|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|      IMPORTS:        (0) utilities.                                         |
 #|                                                                             |
@@ -96,6 +96,10 @@ from utilities import flux
 
 class PulseType:
 
+        # Cached negation of this pulse type (see .negate), filled in
+        # lazily on first use.
+    _negated = None
+
     def __init__(pulseType, pulseAlphabet, symbol):
         pulseType._alphabet = pulseAlphabet
         pulseType._symbol = symbol
@@ -116,8 +120,16 @@ class PulseType:
     @property
     def negate(thisPulseType):
         pt = thisPulseType
-        pa = pt.alphabet
-        return PulseType(pa, pa.negate(pt.symbol))
+        neg = pt._negated
+        if neg is None:
+                # First time; construct the negated pulse type, and link
+                # the two together so that negating either one again just
+                # returns the other.
+            pa = pt.alphabet
+            neg = PulseType(pa, pa.negate(pt.symbol))
+            pt._negated = neg
+            neg._negated = pt
+        return neg
 
     @property
     def alphabet(pulseType):
@@ -127,7 +139,6 @@ class PulseType:
     def symbol(pulseType):
         return pulseType._symbol
 
-    # Not currently used.
     @property
     def index(pulseType):
         return pulseType._index
@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType.                                        |
+#|      IMPORTED BY:    (2) deviceType.                                        |
 #|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|                                                                             |
@@ -79,9 +79,12 @@ __all__ = [
         #|      are considered equal).
         #|
         #|
-        #|  Public properties:
+        #|  Public attributes:
         #|  ------------------
         #|
+        #|      These are plain (slot) attributes rather than
+        #|      properties, and should be treated as read-only.
+        #|
         #|      .portIndex [non-negative integer] - For an N-port
         #|          device, this is the index i, where 0 <= i < N, 
         #|          of the port specified by this signal character.
@@ -89,59 +92,75 @@ __all__ = [
         #|      .pulseType [PulseType] - An object specifying the 
         #|          type of pulse that is entering or leaving.
         #|
+        #|      .characterClass [CharacterClass] - The character
+        #|          class that this signal character belongs to.
+        #|
+        #|      .flux [integer] - The flux of the pulse type.
+        #|
+        #|      .isUnary [bool] - True iff the character class's
+        #|          pulse-type alphabet is unary (single-valued).
+        #|
+        #|      Signal characters should be obtained via the static
+        #|      method SignalCharacter.of(), which returns the unique
+        #|      instance for a given character class, port index and
+        #|      pulse type.
+        #|
         #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
 class SignalCharacter:
 
+    __slots__ = ('portIndex', 'pulseType', 'characterClass',
+                 'flux', 'isUnary')
+
     def __init__(signalCharacter, portIndex, pulseType, characterClass):
     
-        signalCharacter._portIndex = portIndex
-        signalCharacter._pulseType = pulseType
+        signalCharacter.portIndex = portIndex
+        signalCharacter.pulseType = pulseType
         
-        signalCharacter._characterClass = characterClass
+        signalCharacter.characterClass = characterClass
 
-    @property
-    def flux(thisSigChar):
-        """This property is the flux of the signal character."""
-        return thisSigChar.pulseType.flux
+            # These are derived from the above, but never change, so
+            # we look them up once here instead of on every access.
+        signalCharacter.flux = pulseType.flux
+        signalCharacter.isUnary = characterClass.isUnary
 
-    @property
-    def isUnary(sigChar):
-        return sigChar.characterClass.isUnary
+    @staticmethod
+    def of(characterClass, portIndex, pulseType):
 
-    @property
-    def characterClass(sigChar):
-        return sigChar._characterClass
+        """Returns the (unique) signal character of the given character
+            class with the given port index and pulse type. Use this in
+            preference to the constructor; each distinct signal character
+            is only constructed once, and is then just looked up in the
+            character class's table."""
 
-    @property
-    def portIndex(sigChar):
-        return sigChar._portIndex
-
-    @property
-    def pulseType(sigChar):
-        return sigChar._pulseType
+        row = characterClass._sigCharTable[portIndex]
+        sigChar = row[pulseType.index]
+        if sigChar is None:
+            sigChar = SignalCharacter(portIndex, pulseType, characterClass)
+            row[pulseType.index] = sigChar
+        return sigChar
 
     def negate(thisSigChar):
         sc = thisSigChar
-        return SignalCharacter(sc.portIndex, sc.pulseType.negate, sc.characterClass)
-
-    def portSwap(sigChar, port1, port2):
-        """NOTE: This only makes sense if the pulse alphabets are the same."""
+            # Pulse types cache their own negations, so this doesn't
+            # construct a new PulseType after the first time.
+        return SignalCharacter.of(sc.characterClass, sc.portIndex,
+                                  sc.pulseType.negate)
+
+    def portPermute(sigChar, portPerm):
+        """Returns the signal character with the same pulse type as this
+            one, on the port that <portPerm> (a tuple, mapping each port
+            index to its new index) moves this one's port to. (Port ex-
+            changes and rotations are both done this way.) NOTE: This only
+            makes sense if the pulse alphabets are the same; raises 
+            ValueError otherwise."""
         charClass = sigChar.characterClass
-        assert(charClass.isUniform)
-        if sigChar.portIndex == port1:
-            return SignalCharacter(port2, sigChar.pulseType, charClass)
-        elif sigChar.portIndex == port2:
-            return SignalCharacter(port1, sigChar.pulseType, charClass)
-        else:
+        if not charClass._isUniform:    # (Only raises in this case.)
+            charClass._requireUniform("permute ports")
+        newPort = portPerm[sigChar.portIndex]
+        if newPort == sigChar.portIndex:
             return sigChar      # No change.
-    
-    def portRotate(sigChar, offset):
-        """NOTE: This only makes sense if the pulse alphabets are the same."""
-        charClass = sigChar.characterClass
-        assert(charClass.isUniform)
-        newPort = (sigChar.portIndex + offset)%charClass.nPorts
-        return SignalCharacter(newPort, sigChar.pulseType, charClass)
+        return SignalCharacter.of(charClass, newPort, sigChar.pulseType)
 
     def inStr(sigChar):
         if sigChar.isUnary:
@@ -170,9 +189,8 @@ class SignalCharacter:
     def __lt__(thisSigChar, thatSigChar):
         sc1 = thisSigChar
         sc2 = thatSigChar
-        return ((sc1.portIndex < sc2.portIndex) or
-                ((sc1.portIndex == sc2.portIndex) and
-                 (sc1.pulseType < sc2.pulseType)))
+        return ((sc1.portIndex, sc1.pulseType) <
+                (sc2.portIndex, sc2.pulseType))
 
     def __hash__(sigChar):
         return hash((sigChar.portIndex, sigChar.pulseType))
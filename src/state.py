@@ -33,33 +33,26 @@ from utilities import flux
 class State:
 
 	"""Represents an internal device state, selected from a given state set."""
-	
-	def __init__(newState, stateSet, symbol):
-		newState._stateSet = stateSet
-		newState._symbol = symbol
-	
-	@property
-	def flux(thisState):
-		return flux(thisState.symbol)
 
-	@property
-	def stateSet(thisState):
-		return thisState._stateSet
+		# The public attributes below are plain (slot) attributes rather
+		# than properties, and should be treated as read-only.
+	__slots__ = ('stateSet', 'symbol', 'flux', 'negatable')
 	
-	@property
-	def symbol(thisState):
-		return thisState._symbol
-
-	@property
-	def negatable(thisState):
-		return thisState.stateSet.negatable
+	def __init__(newState, stateSet, symbol):
+		newState.stateSet = stateSet
+		newState.symbol = symbol
+			# Derived attributes; these never change, so compute them once.
+		newState.flux = flux(symbol)
+		newState.negatable = stateSet.negatable
 	
 	def negate(thisState):
 	
 		stateSet = thisState.stateSet
 		symbol = thisState.symbol
 	
-		return State(stateSet, stateSet.negate(symbol))
+			# Negate the raw symbol, then look up the state set's own State
+			# object for the result, rather than allocating a new one.
+		return stateSet.state(stateSet.negateSymbol(symbol))
 
 	def __neg__(thisState):
 		return thisState.negate()
@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (4) barc.                                              |
+#|      IMPORTED BY:    (3) barc.                                              |
 #|      CODE LAYER:     Layer #2 (no imports from above layer #1).       	   |
 #|      IMPORTS:        (1) state.                                             |
 #|                                                                             |
@@ -86,6 +86,24 @@ class StateSet:
     def __init__(stateSet, symbols):
         stateSet._cardinality = len(symbols)
         stateSet._symbols = symbols
+            # Materialize the State objects once, so that iterating over
+            # the state set can be repeated and doesn't re-create them.
+        stateSet._states = tuple(State(stateSet, sym) for sym in symbols)
+            # Map from each symbol to its (canonical) State object.
+        stateSet._stateBySymbol = {st.symbol: st for st in stateSet._states}
+            # The symbols never change, so neither does the hash code.
+        stateSet._hash = hash(tuple(symbols))
+
+    def __setattr__(stateSet, name, value):
+        if getattr(stateSet, '_frozen', False):
+            raise AttributeError(f"state set {stateSet} is frozen; "
+                                 f"can't set attribute '{name}'")
+        super().__setattr__(name, value)
+
+    def freeze(stateSet):
+        """Disallows any further modification of this state set's
+            attributes. Used for the global singleton state sets."""
+        stateSet._frozen = True
 
     @property
     def negatable(stateSet):
@@ -100,11 +118,10 @@ class StateSet:
         return stateSet._symbols
 
     def state(thisStateSet, symbol):
-        return State(thisStateSet, symbol)
+        return thisStateSet._stateBySymbol[symbol]
 
     def states(thisStateSet):
-        tss = thisStateSet
-        return map(lambda sym: tss.state(sym), tss.symbols)
+        return iter(thisStateSet._states)
 
     def __str__(stateSet):
     
@@ -119,7 +136,7 @@ class StateSet:
         return s
 
     def __iter__(stateSet):
-        return stateSet.states()
+        return iter(stateSet._states)
         
     def __eq__(thisStateSet, otherStateSet):
         ss1 = thisStateSet
@@ -127,11 +144,14 @@ class StateSet:
         return set(ss1.symbols) == set(ss2.symbols)
 
     def __hash__(thisStateSet):
-        return hash(tuple(thisStateSet.symbols))
+        return thisStateSet._hash
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # To support state negation, for state sets that support it.
     # Negatable derived classes should implement .negateSymbol().
+    # Callers that know what they have should call .negateState()
+    # or .negateSymbol() directly; .negate() is kept for generic
+    # use, and pays for an isinstance() check on every call.
     
     def negateState(stateSet, state):
         return state.negate()
@@ -153,20 +173,16 @@ class TwoStateSet(StateSet):
     def __init__(twoStateSet, firstSymbol, secondSymbol):
         twoStateSet.firstSymbol = firstSymbol
         twoStateSet.secondSymbol = secondSymbol
+            # Precomputed map from each symbol to its negation.
+        twoStateSet._negMap = {firstSymbol: secondSymbol,
+                               secondSymbol: firstSymbol}
         super().__init__((firstSymbol, secondSymbol))
-    
+
     # We'll declare state negation to be a well-defined operator
     # for all two-state sets.
-    
+
     def negateSymbol(twoStateSet, symbol):
-    
-        firstSymbol = twoStateSet.firstSymbol
-        secondSymbol = twoStateSet.secondSymbol
-    
-        if symbol == firstSymbol:
-            return secondSymbol
-        else:
-            return firstSymbol
+        return twoStateSet._negMap[symbol]
 
 #-------------------------------------------------------------------------------
 
@@ -211,7 +227,7 @@ class SymmetricThreeStateSet(ThreeStateSet):
         super().__init__(-1, 0, +1)
 
     # State negation is a well-defined operator for this state set.
-    def negate(this, symbol):
+    def negateSymbol(this, symbol):
         return -symbol
 
 #-------------------------------------------------------------------------------
@@ -223,5 +239,12 @@ theLRStateSet = LRStateSet()
 
 theSymmetricThreeStateSet = SymmetricThreeStateSet()
 
+    # These singletons are shared by everything that uses them, and all of
+    # their derived data is computed at construction, so freeze them.
+
+theSymmetricTwoStateSet.freeze()
+theLRStateSet.freeze()
+theSymmetricThreeStateSet.freeze()
+
 
-#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
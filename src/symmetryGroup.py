@@ -11,9 +11,8 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (4) barc.                                              |
-#|      CODE LAYER:     Layer #1 (no imports from above layer #0).       	   |
-#|      IMPORTS:        (0) utilities.                                         |
+#|      IMPORTED BY:    (3) barc.                                              |
+#|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|-----------------------------------------------------------------------------+
 #|                                                                             |
@@ -45,8 +44,42 @@ __all__ = [
                 # Subclass for symmetry groups that are group products.
     ]
 
-# Imports.
-from    utilities   import count    # Counts the elements of an iterable.
+# Functions:
+
+def _permOrbit(basePerm, actions, relabelPerm):
+
+    """Returns a tuple of all the permutation tuples (see the ._perm 
+        attribute of TransitionFunction) reachable from basePerm by any
+        sequence of the given syndrome actions, each of which is a pair
+        (relabeling, reverses) as returned by a symmetry transform's 
+        .syndromeAction() method. basePerm comes first, followed by the 
+        rest in breadth-first order. relabelPerm is the function used to
+        apply an action to a permutation (normally the static method
+        TransitionFunction.relabelPerm; we're passed it so that this
+        module doesn't need to import transitionFunction).
+
+        This is the inner loop of all of our orbit enumeration, and it
+        works only on tuples of integers, so callers that just need to
+        know how big an orbit is never need to construct any device 
+        functions at all."""
+
+    seen = {basePerm}
+    orbit = [basePerm]
+
+    frontier = [basePerm]
+    while frontier:
+        newFrontier = []
+        for perm in frontier:
+            for (relabeling, reverses) in actions:
+                newPerm = relabelPerm(perm, relabeling, reverses)
+                if newPerm not in seen:
+                    seen.add(newPerm)
+                    newFrontier.append(newPerm)
+        orbit += newFrontier
+        frontier = newFrontier
+
+    return tuple(orbit)
+
 
 # Classes:
 
@@ -56,6 +89,9 @@ class SymmetryGroup:    # Class of symmetry equivalence groups.
         functions (of a given device type) that are all equivalent under 
         a given symmetry transformation, or a combination of symmetry 
         transformations."""
+
+    __slots__ = ('deviceType', 'symmetryTransform', 'baseDevice',
+                 '_uniqueCache', '_orbit')
         
     def __init__(newSymmetryGroup, deviceType, symmetryTransform,
                     baseDevice):
@@ -66,46 +102,86 @@ class SymmetryGroup:    # Class of symmetry equivalence groups.
         nsg.symmetryTransform = symmetryTransform
         
         nsg.baseDevice = baseDevice
+
+            # The set of unique elements never changes once we've got our
+            # transform and base device, so we cache it on first use.
+        nsg._uniqueCache = None
+        nsg._orbit = None           # Likewise for the orbit (as a tuple).
        
     
     def elements(thisSymmetryGroup):
-        """Generates the elements of this group."""
+        """Returns an iterator over the elements of this group."""
+
+        sg = thisSymmetryGroup
+
+        if sg._orbit is None:
+            sg._orbit = tuple(sg._enumerateOrbit())
+
+        return iter(sg._orbit)
+
+
+    def _enumerateOrbit(thisSymmetryGroup):
+        """Generates the orbit of the base device under our transform, by
+            applying the transform repeatedly until we get back to a device
+            we've already seen. (Since the transform is a bijection, that
+            will be the base device.) The work is done on permutation tuples
+            by _permOrbit(), which keeps the ones it's seen in a set; the
+            tuples themselves are the keys, so a hash collision can't end
+            the orbit early."""
 
         sg = thisSymmetryGroup
         st = sg.symmetryTransform
 
         #print(f"\tEnumerating the elements of symmetry group: {str(sg)}")
 
-        device = sg.baseDevice
-    
-        yield device    # Always yield the base device, at least.
-    
-        while True:
-        
-            device = st(device)     # Transform to next device in group.
-            
-            #print(f"\n\nAfter doing a transformation, I got device #{device.ID()}.")
-            
-            if device == sg.baseDevice:
-                break
-            else:
-                yield device
+        base = sg.baseDevice
+        yield base      # Always yield the base device, at least.
+
+        tf = base.transitionFunction
+        orbit = _permOrbit(tf.perm, (st.syndromeAction(),), tf.relabelPerm)
+
+        for perm in orbit[1:]:
+            yield base.withPerm(perm)
     
 
     def uniqueElements(thisSymmetryGroup):
-        """Returns an iterable of the unique elements of this group."""
-        return thisSymmetryGroup.elements()
+        """Returns a (cached) frozenset of the unique elements of this 
+            group."""
+        sg = thisSymmetryGroup
+        if sg._uniqueCache is None:
+            sg._uniqueCache = frozenset(sg.elements())
+        return sg._uniqueCache
     
 
     def cardinality(thisSymmetryGroup):
         """Returns the number of unique elements in this group."""
-        return count(thisSymmetryGroup.uniqueElements())
+
+        sg = thisSymmetryGroup
+
+            # If we've already enumerated the group, just count it.
+        if sg._orbit is not None:
+            return len(sg._orbit)   # Orbit elements are distinct.
+        if sg._uniqueCache is not None:
+            return len(sg._uniqueCache)
+
+            # The orbit of the base device under our transform st is as
+            # big as the smallest d>0 such that st^d maps the base device
+            # to itself; and d must divide the order of st. So we can just
+            # try those divisors, without enumerating the orbit.
+        st = sg.symmetryTransform
+        base = sg.baseDevice
+        order = st.order()
+        for d in range(1, order):
+            if order % d == 0:
+                (relabeling, reverses) = st.powerAction(d)
+                if base.relabel(relabeling, reverses) == base:
+                    return d
+        return order
     
 
     def contains(thisSymmetryGroup, device) -> bool:
         """Returns True if the given device is in this group."""
-        sg = thisSymmetryGroup
-        return sg.symmetryTransform.sameGroup(sg.baseDevice, device)
+        return device in thisSymmetryGroup.uniqueElements()
 
 
     def __str__(thisSymmetryGroup):
@@ -122,6 +198,9 @@ class CompositeSymmetryGroup(SymmetryGroup):
         simple symmetry groups defined by different symmetry transformations.  
         It includes all devices that are equivalent under any sequence of
         symmetry transformations in the set."""
+
+    __slots__ = ('transformList',      # In addition to our parent's slots.
+                 '_orbitPerms')
     
     def __init__(newCompositeSymmetryGroup, deviceType, transformList,
                     baseDevice):
@@ -132,6 +211,9 @@ class CompositeSymmetryGroup(SymmetryGroup):
         ncsg.transformList = transformList
         ncsg.baseDevice = baseDevice
 
+        ncsg._uniqueCache = None    # See SymmetryGroup.__init__().
+        ncsg._orbitPerms = None     # Cached result of ._permutations().
+
 
     def __str__(thisSymmetryGroup):
     
@@ -146,78 +228,56 @@ class CompositeSymmetryGroup(SymmetryGroup):
         return s
 
 
-    def elements(thisSymmetryGroup):
+    def _permutations(thisSymmetryGroup):
 
-        """Enumerating the elements of a composite symmetry group is done
-            using a recursive algorithm."""
+        """Returns a (cached) tuple of the permutation tuples of all the
+            elements of this group, base device first. These are found by
+            a breadth-first closure (see _permOrbit()): starting from the
+            base device, we repeatedly apply each of the transforms' syndrome
+            actions to the permutations found so far, until no new ones turn
+            up. Since each transform generates a finite (cyclic) group, this
+            finds each element exactly once."""
 
         tsg = thisSymmetryGroup
-    
-        #print(f"Enumerating the elements of symmetry group: {str(tsg)}")
-        #print(f"Starting enumeration from base device {tsg.baseDevice.ID()}, "
-        #      f"which is: {str(tsg.baseDevice)}")
 
-        transformList = tsg.transformList
-            # Note this is a list not a set just to make sure order stays consistent
-        
-        def _elems_recur(base, tlist):
-        
-            #print(f"Entering recursion from device {base.ID()} with transform list:", end='')
-            #s = "["
-            #for tr in tlist:
-            #    s += tr.sym + ','
-            #s = s[:-1]
-            #print(s+']')
-        
-            if tlist == []:     # Should never happen, but just in case
-                yield base
-      
-            st = tlist[0]
-            
-            rest = tlist[1:]
-
-            tempGroup = SymmetryGroup(tsg.deviceType, st, base)
-            
-            for elem in tempGroup.elements():
-            
-                if len(rest) == 0:
-                    yield elem
-                else:
-                    for dev in _elems_recur(elem, rest):
-                        yield dev
-        
-        #print("we got here")
-        
-        for dev in _elems_recur(tsg.baseDevice, transformList):
-            yield dev
-        
-        #print("we didn't get here")
+        if tsg._orbitPerms is None:
 
+            transformList = tsg.transformList
+                # Note this is a list not a set just to make sure order stays consistent
 
-    def uniqueElements(thisSymmetryGroup):
+            actions = [st.syndromeAction() for st in transformList]
 
-        """This is needed because generally for products of mutually
-            commuting subgroups, there will be more than one way to
-            generate any given element."""
+            tf = tsg.baseDevice.transitionFunction
+            tsg._orbitPerms = _permOrbit(tf.perm, actions, tf.relabelPerm)
 
-        elemSet = set()
-        for elem in thisSymmetryGroup.elements():
-            elemSet.add(elem)
-        return elemSet
+        return tsg._orbitPerms
 
 
-    def contains(thisSymmetryGroup, device):
-    
-        """Returns True if and only if this symmetry group contains
-            the given device.  The present implementation is iterative,
-            and we could probably do better with some kind of caching
-            of the set of unique group elements."""
-            
-        for elem in thisSymmetryGroup.elements():
-            if device == elem:
-                return True
-                
-        return False
+    def elements(thisSymmetryGroup):
+
+        """Generates the elements of this composite symmetry group. We only
+            construct device functions for the elements other than the base
+            device; see ._permutations(), above."""
+
+        tsg = thisSymmetryGroup
+
+        base = tsg.baseDevice
+        yield base      # Always yield the base device, at least.
+
+        for perm in tsg._permutations()[1:]:
+            yield base.withPerm(perm)
+
+
+    # NOTE: The inherited .uniqueElements() and .contains() methods work 
+    # from the cached set of elements produced above.
+
+    def cardinality(thisSymmetryGroup):
+        """Returns the number of unique elements in this group. (Note that
+            Burnside's lemma doesn't help us here: it counts the number of 
+            orbits of a group action, whereas what we want is the size of 
+            one particular orbit; so we just enumerate it, but only as far
+            as the permutations, without making device functions.)"""
+        return len(thisSymmetryGroup._permutations())
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
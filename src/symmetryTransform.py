@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType                                         |
+#|      IMPORTED BY:    (2) deviceType                                         |
 #|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|-----------------------------------------------------------------------------+
@@ -136,7 +136,8 @@
             R(+)*R(+) = R(-) and R(-)*R(-) = R(+).
         
     Note that we also support arbitrary "composite" transforms, which are 
-    products of the above.
+    products of the above, and the identity transform (I), which is what a
+    composite or power of transforms reduces to when they all cancel out.
     
     Some additional transformations which we may implement later are:
     
@@ -168,14 +169,24 @@ __all__ = [
 
         # Public class of arbitrary composite transforms:
         'CompositeTransform',
+
+        # Public class of identity transforms (I):
+        'IdentityTransform',
     ]
 
+# Imports.
+from math import gcd, lcm     # Greatest common divisor & least common multiple
+                              # (used in computing orders).
+
 
 class SymmetryTransform_:
 
-    """A symmetry transform or transformation is a bijective,
-        non-identity operation on transition functions for a given 
-        device type. The SymmetryTransform_ class is an abstract 
+    """A symmetry transform or transformation is a bijective
+        operation on transition functions for a given device
+        type. (Only the IdentityTransform class, below, leaves
+        every function unchanged; we only get one of those when
+        a composite or power of transforms cancels out.) The
+        SymmetryTransform_ class is an abstract 
         base class (which is what the final '_' is denoting). All 
         symmetry transforms <st> of concrete derived classes should 
         support all of the following methods/properties (however,
@@ -188,9 +199,33 @@ class SymmetryTransform_:
             st.transform() - Returns the transition function that
                 the given transition function <f> maps to under the
                 given transformation <st>.  Concise alternate
-                syntax: st(<f>). (Virtual function; not defined for
-                base class.)
+                syntax: st(<f>). (The base class does this by applying
+                the syndrome action, below; subclasses may override it
+                if they have a quicker way.)
                 
+            st.syndromeAction() - Returns a pair (relabeling, reverses)
+                describing how <st> acts on a transition function's
+                permutation of I/O syndrome indices: the syndrome
+                indices are relabeled by the permutation <relabeling>
+                (a tuple), and then, if <reverses> is True, the
+                function is also reversed. Every transform we support
+                can be described this way, and the description of a
+                composite transform is easily computed from those of
+                its constituents.
+
+            st.primitives - A tuple of the primitive transforms that
+                make up <st>, in the order they're applied; just (<st>,)
+                unless <st> is a composite transform (or the identity,
+                for which it's empty).
+
+            st.order() - Returns the order of <st>, that is, the
+                smallest n>0 such that <st>^n is the identity. This
+                is computed from the syndrome action.
+
+            st.powerAction() - Given an integer n>=0, returns the
+                syndrome action (in the same form as above) of the
+                nth power of <st>.
+
             st.inverse() - Returns another symmetry transformation
                 <st_inv> that is the inverse transformation to <st>.
                 Concise alternate syntax: -st.
@@ -246,17 +281,74 @@ class SymmetryTransform_:
                 checking between composite transformations.)
         
         """
+
+        # All subclasses also declare __slots__ (empty if they add no
+        # attributes of their own), so transforms don't carry a dict.
+    __slots__ = ('_deviceType', '_action', '_order')
     
     def __init__(newSymmetryTransform, deviceType):
         st = newSymmetryTransform
         st._deviceType = deviceType
+        st._action = None       # Syndrome action; computed when needed.
+        st._order = None        # Likewise for the order.
 
     @property
     def deviceType(st):
         return st._deviceType
-    
-    # .transform() is not defined here and should be implemented by 
-    # all concrete subclasses.
+
+    @property
+    def primitives(st):
+        """A tuple of the primitive (non-composite) transforms that make
+            up this one, in the order in which they are applied. For a
+            primitive transform, this is just (st,)."""
+        return (st,)
+    
+    def transform(st, func):
+        """Applies this transform to the given function. The syndrome
+            action is computed just once per transform, so after the
+            first time, this is a single relabeling of the function's
+            permutation of syndrome indices."""
+        (relabeling, reverses) = st.syndromeAction()
+        return func.relabel(relabeling, reverses)
+
+    def syndromeAction(st):
+        """Returns the (relabeling, reverses) pair describing this transform's
+            action on syndrome indices. This is computed the first time by the
+            ._computeSyndromeAction() method, which concrete subclasses should
+            implement, and then cached."""
+        if st._action is None:
+            st._action = st._computeSyndromeAction()
+        return st._action
+
+    def order(st):
+        """Returns the order of this transform. If its syndrome action
+            relabels syndromes by a permutation P, then this is the least
+            common multiple of the lengths of P's cycles; but if it also
+            reverses, then its order must also be even."""
+        if st._order is None:
+            (relabeling, reverses) = st.syndromeAction()
+            order = 2 if reverses else 1
+            seen = [False] * len(relabeling)
+            for start in range(len(relabeling)):
+                if seen[start]:
+                    continue
+                cycleLen = 0
+                i = start
+                while not seen[i]:
+                    seen[i] = True
+                    i = relabeling[i]
+                    cycleLen += 1
+                order = lcm(order, cycleLen)
+            st._order = order
+        return st._order
+
+    def powerAction(st, n):
+        """Returns the syndrome action of the nth power of this transform."""
+        (relabeling, reverses) = st.syndromeAction()
+        power = tuple(range(len(relabeling)))      # Identity relabeling.
+        for _ in range(n % st.order()):
+            power = tuple(relabeling[k] for k in power)
+        return (power, reverses and (n % 2 == 1))
     
     def inverse(st):
         """Return the inverse transform to this one."""
@@ -297,10 +389,16 @@ class SymmetryTransform_:
         """Returns a new, composite symmetry transformation that
             consists of applying first <thisSymmetryTransform>,
             followed by <thatSymmetryTransform>. (Note that this
-            is a "left-compose" operation.)"""
+            is a "left-compose" operation.) If either one is the
+            identity, we just return the other one; and if they're
+            inverses of each other, the result is the identity."""
         st1 = thisSymmetryTransform
         st2 = thatSymmetryTransform
-        return CompositeTransform(st2, st1)
+        if isinstance(st1, IdentityTransform):
+            return st2
+        if isinstance(st2, IdentityTransform):
+            return st1
+        return CompositeTransform(st2, st1)     # (Checks for cancellation.)
     
     def commutesWith(thisSymmetryTransform, thatSymmetryTransform):
         pass    # Not yet implemented.
@@ -311,45 +409,112 @@ class SymmetryTransform_:
     def __call__(st,func):
         return st.transform(func)
 
+    # Two transforms are considered equal if they are of the same class,
+    # for the same device type, and have the same key (see ._key(), which
+    # concrete subclasses should implement). Note that transforms that are
+    # constructed differently may still act the same way without being
+    # considered equal; see the note on CompositeTransform, below.
 
-# Note: We could make the following class more powerful by keeping
-# track of a list of constituent transforms, and flattening the list
-# when combining; this would automatically apply the associative
-# property, to make it easier to detect equivalence between composite
-# transforms constructed in different ways. However, this wouldn't by
-# itself capture all cases of equivalence, so I'm not sure it's 
-# worthwhile. (Note a more general way to detect equivalence between
+    def __eq__(thisSymmetryTransform, thatSymmetryTransform):
+        st1 = thisSymmetryTransform
+        st2 = thatSymmetryTransform
+        if st1 is st2:
+            return True
+        if not isinstance(st2, SymmetryTransform_):
+            return NotImplemented
+        return (type(st1) is type(st2) and
+                (st1._deviceType is st2._deviceType or
+                 st1._deviceType == st2._deviceType) and
+                st1._key() == st2._key())
+
+    def __hash__(st):
+        return hash(st._key())
+
+
+# Note: The following class keeps track of a flat tuple of its primitive
+# constituent transforms, flattening nested composites when combining;
+# this automatically applies the associative property, which makes it
+# easier to detect equivalence between composite transforms constructed
+# in different ways. However, this doesn't by itself capture all cases
+# of equivalence. (Note a more general way to detect equivalence between
 # transforms is just by looking at how they transform all possible
 # transition functions, though this is time-consuming to do for 
 # complex device types.)
 
+def _cancelInverses(primitives):
+    """Given a tuple of primitive transforms, in the order they're applied,
+        returns the tuple that's left after removing adjacent pairs of trans-
+        forms that are inverses of each other (repeatedly, so that, e.g., the
+        sequence R(1), D, D, R(-1) reduces to nothing)."""
+    reduced = []
+    for st in primitives:
+        if reduced and reduced[-1] == st.inverse():
+            reduced.pop()
+        else:
+            reduced.append(st)
+    return tuple(reduced)
+
 class CompositeTransform(SymmetryTransform_):
     """A symmetry transformation that is the composite of two or more
         constituent transformations."""
+
+    __slots__ = ('_symTrans1', '_symTrans2', '_primitives')
+
+    def __new__(cls, st1, st2):
+        """Works out the primitive constituents of the composite of st1
+            and st2, cancelling out any adjacent inverse pairs; if nothing
+            is left, then the composite is just the identity transform, so
+            we return that instead of creating a new composite."""
+        primitives = _cancelInverses(st2.primitives + st1.primitives)
+        if not primitives:
+            return st1.deviceType.identityTransform()
+        nct = super().__new__(cls)
+            # All of our primitive constituents, in the order in which 
+            # they're applied.
+        nct._primitives = primitives
+        return nct
+
     def __init__(newCompositeTransform, st1, st2):
         """Creates a new composite symmetry transformation that
             consists of applying first the transform st2, and
-            then applying the transform st1 to the result of that."""
+            then applying the transform st1 to the result of that.
+            (Its primitives were already worked out by __new__.)"""
         nct = newCompositeTransform
         nct._symTrans1 = st1
         nct._symTrans2 = st2
-        
-    def transform(thisCompositeTransform, func):
-        """Transforms the given function by applying first st2
-            and then st1."""
-        tct = thisCompositeTransform
-        st1 = tct._symTrans1
-        st2 = tct._symTrans2
-        return st1(st2(func))   # Applies st1*st2.
+        super().__init__(st1.deviceType)
+
+    @property
+    def primitives(tct):
+        return tct._primitives
+
+    def _key(tct):
+        return tuple(st._key() for st in tct._primitives)
+
+    def _computeSyndromeAction(tct):
+        """Relabelings commute with reversal, so applying a sequence of
+            transforms just relabels by the composed permutation, and 
+            reverses iff an odd number of the constituents do. We fold
+            the primitives' actions together directly, rather than going
+            through any nested composite transforms."""
+        primitives = tct._primitives
+        (relabeling, reverses) = primitives[0].syndromeAction()
+        for st in primitives[1:]:
+            (nextRelabeling, nextReverses) = st.syndromeAction()
+            relabeling = tuple(nextRelabeling[k] for k in relabeling)
+            reverses = reverses != nextReverses
+        return (relabeling, reverses)
 
 
 class SelfInverseTransform_(SymmetryTransform_):
+    __slots__ = ()
     @property
     def isSelfInverse(st):
         return True
 
 
 class NonSelfInverseTransform_(SymmetryTransform_):
+    __slots__ = ()
     @property
     def isSelfInverse(st):
         return False
@@ -359,8 +524,16 @@ class DirectionReversalTransform(SelfInverseTransform_):
     
     """Maps the transition function to its inverse."""
 
+    __slots__ = ()
+
     def transform(drt, func):
-        return func.reverse()
+        return func.reverse()       # No relabeling needed.
+
+    def _key(drt):
+        return ('D',)
+
+    def _computeSyndromeAction(drt):
+        return (drt.deviceType.identityPerm(), True)   # (Shared tuple.)
 
     @property
     def desc(drt):
@@ -376,8 +549,13 @@ class FluxNegationTransform(SelfInverseTransform_):
     """Negates all polarized I/O fluxes, and also 
         negates the internal state, if it is negatable."""
 
-    def transform(fnt, func):
-        return func.negFlux()
+    __slots__ = ()
+
+    def _computeSyndromeAction(fnt):
+        return (fnt.deviceType.negFluxPerm(), False)
+
+    def _key(fnt):
+        return ('F',)
 
     @property
     def desc(fnt):
@@ -393,8 +571,13 @@ class StateNegationTransform(SelfInverseTransform_):
     """Only usable for device types with a negatable
         state set.  Negates only the internal state."""
 
-    def transform(fnt, func):
-        return func.negStates()
+    __slots__ = ()
+
+    def _computeSyndromeAction(snt):
+        return (snt.deviceType.negStatePerm(), False)
+
+    def _key(snt):
+        return ('S',)
 
     @property
     def desc(snt):
@@ -410,23 +593,31 @@ class PortExchangeTransform(SelfInverseTransform_):
     """Only usable for device types with at least 2 ports.
         Exchanges a specified pair of the ports."""
 
+    __slots__ = ('port1', 'port2', 'portPerm')
+
     def __init__(newPortSwapTrans, devType, port1, port2):
     
         npst = newPortSwapTrans
 
             # Canonicalize port order.
         if port1 > port2:
-            tmp = port1
-            port1 = port2
-            port2 = tmp
+            port1, port2 = port2, port1
 
         npst.port1 = port1
         npst.port2 = port2
+
+            # Where each port index goes, as a tuple.
+        portPerm = list(range(devType.nPorts))
+        portPerm[port1], portPerm[port2] = port2, port1
+        npst.portPerm = tuple(portPerm)
         
         super().__init__(devType)
 
-    def transform(pst, func):
-        return func.portSwap(pst.port1, pst.port2)
+    def _computeSyndromeAction(pst):
+        return (pst.deviceType.portPermutePerm(pst.portPerm), False)
+
+    def _key(pst):
+        return ('E', pst.port1, pst.port2)     # (Ports are in canonical order.)
 
     @property
     def desc(pet):
@@ -442,19 +633,47 @@ class PortRotationTransform(NonSelfInverseTransform_):
     """Only usable for device types with at least 3 ports.
         This transformation simply rotates each port index
         to the next, in circular fashion."""
+
+    __slots__ = ('offset', 'portPerm', '_inverse')
         
     def __init__(newPortRotTrans, devType, offset):
         nprt = newPortRotTrans
         nprt.offset = offset
+        nprt._inverse = None    # Inverse transform; created when needed.
+            # Where each port index goes, as a tuple.
+        nPorts = devType.nPorts
+        nprt.portPerm = tuple((p + offset) % nPorts for p in range(nPorts))
         super().__init__(devType)
+            # Every port is on a cycle of the same length, so we already
+            # know the order, without looking at the syndrome action.
+        nprt._order = nPorts // gcd(offset % nPorts, nPorts)
         
-    def transform(prt, func):
-        return func.portRotate(prt.offset)
+    def _computeSyndromeAction(prt):
+        return (prt.deviceType.portPermutePerm(prt.portPerm), False)
+
+    def _key(prt):
+            # Offsets that are equal mod the number of ports are equivalent.
+        return ('R', prt.offset % prt.deviceType.nPorts)
 
     def inverse(prt):
         """To invert a port-rotation transformation, 
-            we simply negate its offset."""
-        return PortRotationTransform(-prt.offset)
+            we simply negate its offset. The inverse is only
+            created once, and knows that we are its inverse."""
+        if prt._inverse is None:
+            inv = PortRotationTransform(prt.deviceType, -prt.offset)
+            inv._inverse = prt
+            prt._inverse = inv
+        return prt._inverse
+
+    def toPower(prt, n):
+        """The nth power of a port rotation is just the rotation by
+            n times the offset (mod the number of ports). If that comes
+            out to 0, the result is the identity transform."""
+        dt = prt.deviceType
+        offset = (prt.offset * n) % dt.nPorts
+        if offset == 0:
+            return dt.identityTransform()
+        return PortRotationTransform(dt, offset)
 
     @property
     def desc(prt):
@@ -465,4 +684,43 @@ class PortRotationTransform(NonSelfInverseTransform_):
         return f'R({prt.offset})'
 
 
+class IdentityTransform(SelfInverseTransform_):
+
+    """Leaves every transition function unchanged. This isn't one of
+        the transforms we report on; it's what composites and powers of
+        other transforms reduce to when they cancel out. There is just
+        one instance per device type (see DeviceType.identityTransform()),
+        so it can be recognized with "is"."""
+
+    __slots__ = ()
+
+    def __init__(newIdentityTransform, devType):
+        super().__init__(devType)
+        newIdentityTransform._order = 1
+
+    @property
+    def primitives(it):
+        return ()       # So it drops out of any composite it's part of.
+
+    def transform(it, func):
+        return func
+
+    def _key(it):
+        return ('I',)
+
+    def _computeSyndromeAction(it):
+        return (it.deviceType.identityPerm(), False)
+
+    def toPower(it, n):
+        return it
+
+    @property
+    def desc(it):
+        return "(Identity)"
+
+    @property
+    def sym(it):
+        return 'I'
+
+
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
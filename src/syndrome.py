@@ -11,7 +11,7 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType                                         |
+#|      IMPORTED BY:    (2) deviceType                                         |
 #|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|                                                                             |
@@ -69,7 +69,16 @@ __all__ = [
 
 
     #|======================================================================
-    #| Module section 1. Class definitions.                 [code section]
+    #| Module section 1. Imports.                           [code section]
+    #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
+
+from weakref import WeakValueDictionary
+    # A dictionary that doesn't keep its values alive. (Used for
+    # interning syndromes; see Syndrome.of().)
+
+
+    #|======================================================================
+    #| Module section 2. Class definitions.                 [code section]
     #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
         #|--------------------------------------------------------------
@@ -95,15 +104,55 @@ __all__ = [
         #|      .state [object] - The label of the (initial or final)
         #|          device state, as appropriate.
         #|
+        #|      Plain syndromes should be obtained via the static
+        #|      method Syndrome.of(), which returns the same instance
+        #|      for the same signal character and state, so long as
+        #|      that instance is still in use.
+        #|
         #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
 class Syndrome:
 
+    __slots__ = ('_signalCharacter', '_state', '_key', '_hash', '_str',
+                 '__weakref__')
+
+        # Plain syndromes currently in use, keyed by the identities of
+        # their signal character and state objects; see .of(), below.
+    _interned = WeakValueDictionary()
+
     def __init__(syndrome, signalCharacter, state):
     
         syndrome._signalCharacter = signalCharacter
         syndrome._state           = state
 
+            # Syndromes never change, so build the tuple we compare them
+            # by, and its hash code, up front.
+        syndrome._key = key = (signalCharacter, state)
+        syndrome._hash = hash(key)
+
+            # String representation (for input and output syndromes);
+            # built the first time it's asked for.
+        syndrome._str = None
+
+    @staticmethod
+    def of(signalCharacter, state):
+        """Returns a syndrome with the given signal character and state,
+            reusing an existing one if there is one still in use."""
+            # NOTE: We can't key on the objects' values here, since (for
+            # example) states from different state sets compare equal if
+            # their symbols do, and signal characters from different char-
+            # acter classes compare equal if their ports and pulse types
+            # do; but we want a syndrome that refers to the very same ones
+            # we were given. Their ids can't be reused while the syndrome
+            # that we've stored refers to them, so this key is safe.
+        interned = Syndrome._interned
+        key = (id(signalCharacter), id(state))
+        syndrome = interned.get(key)
+        if syndrome is None:
+            syndrome = Syndrome(signalCharacter, state)
+            interned[key] = syndrome
+        return syndrome
+
     @property
     def flux(thisSyndrome):
         """This property is the net flux of the syndrome."""
@@ -137,60 +186,61 @@ class Syndrome:
         """Returns an I/O syndrome like this one, but all fluxes
             are negated."""
         ts = thisSyndrome
-        return Syndrome(ts.signalCharacter.negate(), ts.state.negate())
+        return Syndrome.of(ts.signalCharacter.negate(), ts.state.negate())
 
     def negState(thisSyndrome):
         """Returns an I/O syndrome like this one, but the internal
             state is negated."""
         ts = thisSyndrome
-        return Syndrome(ts.signalCharacter, ts.state.negate())
+        return Syndrome.of(ts.signalCharacter, ts.state.negate())
 
-    def portExchange(thisSyndrome, port1, port2):
+    def portPermute(thisSyndrome, portPerm):
+        """Returns an I/O syndrome like this one, but with its port
+            index mapped through <portPerm> (a tuple of port indices)."""
         ts = thisSyndrome
-        return Syndrome(ts.signalCharacter.portSwap(port1, port2), ts.state)
-
-    def portSwap(thisSyndrome, port1, port2):
-        return thisSyndrome.portExchange(port1, port2)
-
-    def portRotate(thisSyndrome, offset):
-        ts = thisSyndrome
-        return Syndrome(ts.signalCharacter.portRotate(offset), ts.state)
+        return Syndrome.of(ts.signalCharacter.portPermute(portPerm), ts.state)
         
     def stateSwap(thisSyndrome):
         ts = thisSyndrome
-        return Syndrome(ts.signalCharacter, ts.state.swap())
+        return Syndrome.of(ts.signalCharacter, ts.state.swap())
+
+    # Syndromes are compared by their (signal character, state) tuples,
+    # which do the field-by-field work for us.
 
     def __eq__(thisSyndrome, thatSyndrome):
         ts1 = thisSyndrome
         ts2 = thatSyndrome
-        return ((ts1.signalCharacter == ts2.signalCharacter) and
-                (ts1.state == ts2.state))
+        return ts1 is ts2 or ts1._key == ts2._key
     
     def __lt__(thisSyndrome, thatSyndrome):
         """Used for canonicalizing transition function order; 
             facilitates transition function equality testing."""
-        ts1 = thisSyndrome
-        ts2 = thatSyndrome
-        return ((ts1.signalCharacter < ts2.signalCharacter) or
-                ((ts1.signalCharacter == ts2.signalCharacter) and
-                 (ts1.state < ts2.state)))
+        return thisSyndrome._key < thatSyndrome._key
 
     def __hash__(syndrome):
-        return hash((syndrome.signalCharacter, syndrome.state))
+        return syndrome._hash
 
 class InputSyndrome(Syndrome):
 
+    __slots__ = ()      # No attributes beyond those of Syndrome.
+
     def __str__(this):
+
+        if this._str is None:
     
-        sc = this.signalCharacter
-        st = this.state
+            sc = this.signalCharacter
+            st = this.state
     
-        return f"{sc.inStr()}({str(st)})"
+            this._str = f"{sc.inStr()}({str(st)})"
+
+        return this._str
     
         #return "%s>(%s)" % (this.signalCharacter, this.state)
 
 class OutputSyndrome(Syndrome):
 
+    __slots__ = ()      # Likewise.
+
         # Reverse argument order in initializer:
         #   OutputSyndrome(state, sigChar)
 
@@ -198,11 +248,15 @@ class OutputSyndrome(Syndrome):
         super().__init__(signalCharacter, state)
 
     def __str__(this):
+
+        if this._str is None:
     
-        sc = this.signalCharacter
-        st = this.state
+            sc = this.signalCharacter
+            st = this.state
     
-        return f"({str(st)}){sc.outStr()}"
+            this._str = f"({str(st)}){sc.outStr()}"
+
+        return this._str
     
         #return "(%s)>%s" % (this.state, this.signalCharacter)
 
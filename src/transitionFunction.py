@@ -11,9 +11,8 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (2) deviceFunction                                     |
-#|      CODE LAYER:     Layer #1 (no imports from above layer #0).       	   |
-#|      IMPORTS:        (0) utilities.                                         |
+#|      IMPORTED BY:    (1) deviceFunction                                     |
+#|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|-----------------------------------------------------------------------------+
 #|                                                                             |
@@ -35,9 +34,6 @@
 #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv|
 """Support for raw (low-level) device transition functions."""
 
-# Imports.
-from utilities import hashdict      # Returns the hash of a dictionary.
-
     #/~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #|  TransitionFunction                              [module public class]
     #|
@@ -58,22 +54,55 @@ class TransitionFunction:
 
     # Instance private data members:
     #   ._deviceType - The type of device that this transition function is for.
-    #   ._ioMap - The map implemented by this transition function.  Defaults to
-    #               an identity map over all I/O syndromes.
+    #   ._perm - The map implemented by this transition function, as a tuple
+    #               of syndrome indices (see DeviceType.syndromeIndex()); the
+    #               input syndrome with index i maps to the output syndrome
+    #               with index ._perm[i].
+    #   ._ioMap - The same map, as a dictionary from input syndromes to
+    #               output syndromes.
+    #   ._packed - The same map again, packed into a single integer with one
+    #               byte per syndrome index (see .packedPerm); or None if it
+    #               hasn't been computed yet.
+    #   ._hash - Cached hash code (computed on first use); this is safe since
+    #               transition functions are never modified once constructed.
+    #   ._conservesFlux, ._changesState, ._changesPort - Likewise, cached
+    #               results of the corresponding predicates (None until the
+    #               predicate is first called).
+    #   ._portActive - Dict of cached results of .portIsActive(), by port.
+    #
+    # Either one of ._perm and ._ioMap may be None, in which case it is 
+    # computed from the other one when first needed. If neither is given
+    # to the constructor, we default to the identity map.
 
-    def __init__(transitionFunction, deviceType, ioMap = None):
+        # We create lots of these, so don't give them a per-instance dict.
+        # (But they do need to be weakly referenceable; see .fromPerm().)
+    __slots__ = ('_deviceType', '_perm', '_ioMap', '_packed', '_hash',
+                 '_conservesFlux', '_changesState', '_changesPort',
+                 '_portActive', '__weakref__')
+
+    def __init__(transitionFunction, deviceType, ioMap = None, perm = None):
     
         transitionFunction._deviceType = deviceType
 
             # If no map from input to output syndromes was provided,
-            # then default to the identity map.
+            # then default to the identity map. The device type keeps
+            # both forms of that, so we can just share them.
         
-        if ioMap == None:
-            ioMap = dict()
-            for syndrome in deviceType.syndromes():
-                ioMap[syndrome.asInput()] = syndrome.asOutput()
+        if ioMap is None and perm is None:
+            perm = deviceType.identityPerm()
+            ioMap = deviceType.identityIOMap()
                 
         transitionFunction._ioMap = ioMap
+        transitionFunction._perm = perm
+
+        transitionFunction._packed = None   # Not computed yet.
+        transitionFunction._hash = None     # Likewise.
+
+            # Memoized predicate results (see above); not computed yet.
+        transitionFunction._conservesFlux = None
+        transitionFunction._changesState = None
+        transitionFunction._changesPort = None
+        transitionFunction._portActive = dict()
 
     # Instance public properties:
 
@@ -83,91 +112,186 @@ class TransitionFunction:
 
     @property
     def ioMap(transitionFunction):
-        return transitionFunction._ioMap
+        tf = transitionFunction
+        if tf._ioMap is None:
+            dt = tf._deviceType
+                # Bind these methods locally, since we use them in a loop.
+            inputSyndrome = dt.inputSyndrome
+            outputSyndrome = dt.outputSyndrome
+            tf._ioMap = {inputSyndrome(i): outputSyndrome(j)
+                            for (i, j) in enumerate(tf._perm)}
+        return tf._ioMap
+
+    @property
+    def perm(transitionFunction):
+        tf = transitionFunction
+        if tf._perm is None:
+            syndromeIndex = tf._deviceType.syndromeIndex    # Bind locally.
+            perm = [None] * len(tf._ioMap)
+            for (inSyn, outSyn) in tf._ioMap.items():
+                perm[syndromeIndex(inSyn)] = syndromeIndex(outSyn)
+            tf._perm = tuple(perm)
+        return tf._perm
+
+    @property
+    def packedPerm(transitionFunction):
+        """Our permutation of syndrome indices (.perm), packed into a single
+            integer whose i'th byte (from the bottom) is .perm[i]. Two tran-
+            sition functions of the same device type are equal iff their
+            packed permutations are equal, and comparing or hashing one 
+            integer is cheaper than doing so for a tuple. (In the unlikely 
+            case that a device type has more than 256 syndromes, this is 
+            just the permutation tuple itself.)"""
+        tf = transitionFunction
+        if tf._packed is None:
+            perm = tf.perm
+            if len(perm) <= 256:
+                tf._packed = int.from_bytes(bytes(perm), 'little')
+            else:
+                tf._packed = perm
+        return tf._packed
 
     # Instance public methods:
 
+    # NOTE: Transition functions never change, so the predicates below only 
+    # compute their result the first time, and then just return it.
+
     def conservesFlux(thisTransFunc):
         """Boolean; returns True iff this transition function conserves flux."""
         tf = thisTransFunc
-        
-        ioMap = tf.ioMap
-        for (inSyn,outSyn) in ioMap.items():
-            inFlux = inSyn.flux
-            outFlux = outSyn.flux
-            if inFlux != outFlux:
-                return False        # Nope; flux isn't conserved.
+        if tf._conservesFlux is None:
+            tf._conservesFlux = tf._checkConservesFlux()
+        return tf._conservesFlux
 
-        # If we get here, then flux is conserved.
-        return True
+    def _checkConservesFlux(thisTransFunc):
+            # Flux is conserved unless some case changes it; any() stops
+            # at the first such case.
+        return not any(inSyn.flux != outSyn.flux
+                        for (inSyn, outSyn) in thisTransFunc.ioMap.items())
 
     def changesState(transFunc):
         """Return True iff the transition function changes the state in any case."""
-        doesIt = False
-        ioMap = transFunc.ioMap
-        for (inSyn,outSyn) in ioMap.items():
-            if not inSyn.state == outSyn.state:
-                doesIt = True
-        return doesIt
+        tf = transFunc
+        if tf._changesState is None:
+            tf._changesState = tf._checkChangesState()
+        return tf._changesState
+
+    def _checkChangesState(transFunc):
+        return any(not inSyn.state == outSyn.state
+                    for (inSyn, outSyn) in transFunc.ioMap.items())
 
     def changesPort(transFunc):
         """Return True iff the transition function changes the I/O port in any case.
             (Otherwise, if it's flux-neutral, it's just a set of reflectors with
             no way to do state readout..)"""
-        doesIt = False
-        ioMap = transFunc.ioMap
-        for (inSyn,outSyn) in ioMap.items():
-            if not inSyn.port == outSyn.port:
-                doesIt = True
-        return doesIt
+        tf = transFunc
+        if tf._changesPort is None:
+            tf._changesPort = tf._checkChangesPort()
+        return tf._changesPort
+
+    def _checkChangesPort(transFunc):
+        return any(not inSyn.port == outSyn.port
+                    for (inSyn, outSyn) in transFunc.ioMap.items())
         
     def portIsActive(transFunc, port):
         """Return True if the given port is active, meaning that it either changes
             or causes the state to change. If it does neither, then it's just a 
             simple reflector and is unrelated to the rest of the device."""
-        isActive = False
-        ioMap = transFunc.ioMap
-        for (inSyn,outSyn) in ioMap.items():
-            if inSyn.port == port:
-                if not (outSyn.port == port):
-                    isActive = True
-                if not (inSyn.state == outSyn.state):
-                    isActive = True
+        portActive = transFunc._portActive
+        isActive = portActive.get(port)
+        if isActive is None:
+            isActive = transFunc._checkPortIsActive(port)
+            portActive[port] = isActive
         return isActive
+
+    def _checkPortIsActive(transFunc, port):
+            # Active iff some input on this port leaves from a different
+            # port, or changes the state.
+        return any(inSyn.port == port and
+                    (not outSyn.port == port or
+                     not inSyn.state == outSyn.state)
+                    for (inSyn, outSyn) in transFunc.ioMap.items())
         
-    def applyTo(transitionFunction, syndrone):
+    def applyTo(transitionFunction, syndrome):
         """Invoked on a transition function <tf>, with a single argument
             that is an I/O syndrome <s>, interpreted as an input syndrome,
             this returns the result of applying <tf> to <s>; i.e., the 
             corresponding output syndrome.
             
             Concise alternate syntax: <tf>(<s>)."""
-        return transitionFunction.ioMap[syndrome.asInput()]
+            # Syndromes compare equal regardless of whether they are input
+            # or output syndromes, so we don't need to call .asInput() here;
+            # and going through the syndrome indices avoids building ioMap.
+        dt = transitionFunction._deviceType
+        return dt.outputSyndrome(transitionFunction.perm[dt.syndromeIndex(syndrome)])
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # The below methods are to support symmetry transformations.
+    #
+    # Each of these (except .reverse()) relabels the I/O syndromes by some
+    # permutation P of syndrome indices (which the device type precomputes),
+    # so that if we mapped i -> j before, we now map P[i] -> P[j].
     
+    def relabel(thisTransitionFunction, relabeling, reverse=False):
+        """Returns the transition function obtained from this one by 
+            relabeling its syndrome indices using the given permutation,
+            and then (if <reverse> is True) reversing it. This is the 
+            general form of all of the transformations below; see also
+            SymmetryTransform_.syndromeAction()."""
+
+        tf = thisTransitionFunction
+        newPerm = TransitionFunction.relabelPerm(tf.perm, relabeling, reverse)
+        return TransitionFunction.fromPerm(tf.deviceType, newPerm)
+
+    @staticmethod
+    def fromPerm(deviceType, perm):
+        """Returns the transition function of the given device type with
+            the given permutation tuple. So long as a transition function
+            constructed this way is still in use, it is returned again for
+            the same permutation, rather than making a new one; so, e.g., 
+            testing whether a transform maps a function to itself usually
+            succeeds on the first (identity) check in .__eq__(), and any 
+            memoized predicates are shared."""
+
+        interned = deviceType._transFuncs
+        tf = interned.get(perm)
+        if tf is None:
+            tf = TransitionFunction(deviceType, perm=perm)
+            interned[perm] = tf
+        return tf
+
+    @staticmethod
+    def relabelPerm(perm, relabeling, reverse=False):
+        """Does the work of .relabel() directly on a permutation tuple
+            (see ._perm, above), returning the new permutation tuple. This
+            lets callers that are exploring many transformed functions work
+            on permutations, without constructing TransitionFunction objects
+            for all of them."""
+
+        newPerm = [None] * len(perm)
+        if reverse:
+            for (i, j) in enumerate(perm):
+                newPerm[relabeling[j]] = relabeling[i]
+        else:
+            for (i, j) in enumerate(perm):
+                newPerm[relabeling[i]] = relabeling[j]
+
+        return tuple(newPerm)
+
     def reverse(thisTransitionFunction):
     
         """Returns a transition function that is the reverse of this one;
             that is, its I/O map is the inverse function to our I/O map."""
         
         tf = thisTransitionFunction
+        perm = tf.perm
 
-        devType = tf.deviceType
-        ioMap = tf.ioMap
-
-        oiMap = dict()
-        
-        for (inputSyndrome, outputSyndrome) in ioMap.items():
-        
-                # Flip syndrome types.
-            outAsIn = outputSyndrome.asInput()
-            inAsOut = inputSyndrome.asOutput()
-        
-            oiMap[outAsIn] = inAsOut
+            # Outputs become inputs and vice-versa, so just invert the perm.
+        invPerm = [None] * len(perm)
+        for (i, j) in enumerate(perm):
+            invPerm[j] = i
             
-        return TransitionFunction(devType, oiMap)
+        return TransitionFunction.fromPerm(tf.deviceType, tuple(invPerm))
     
     def negStates(thisTransitionFunction):
     
@@ -176,17 +300,7 @@ class TransitionFunction:
             to their negations."""
     
         tf = thisTransitionFunction
-
-        devType = tf.deviceType
-        ioMap = tf.ioMap
-        
-        new_ioMap = dict()
-        
-        for (inputSyndrome, outputSyndrome) in ioMap.items():
-            #print(f"Negating state in {inputSyndrome} -> {outputSyndrome}...")
-            new_ioMap[inputSyndrome.negState().asInput()] = outputSyndrome.negState().asOutput()
-            
-        return TransitionFunction(devType, new_ioMap)
+        return tf.relabel(tf.deviceType.negStatePerm())
     
     def negFlux(thisTransitionFunction):
     
@@ -196,16 +310,7 @@ class TransitionFunction:
             then the states are also changed to their negations."""
     
         tf = thisTransitionFunction
-
-        devType = tf.deviceType
-        ioMap = tf.ioMap
-        
-        new_ioMap = dict()
-        
-        for (inputSyndrome, outputSyndrome) in ioMap.items():
-            new_ioMap[inputSyndrome.negFlux().asInput()] = outputSyndrome.negFlux().asOutput()
-            
-        return TransitionFunction(devType, new_ioMap)
+        return tf.relabel(tf.deviceType.negFluxPerm())
     
     def portSwap(thisTransitionFunction, port1, port2):
     
@@ -213,20 +318,10 @@ class TransitionFunction:
             except that the two given port indices are exchanged."""
 
         tf = thisTransitionFunction
-
-        devType = tf.deviceType
-        ioMap = tf.ioMap
-        
-        new_ioMap = dict()
-        
-        for (inputSyndrome, outputSyndrome) in ioMap.items():
-        
-            new_is = inputSyndrome.portSwap(port1, port2).asInput()
-            new_os = outputSyndrome.portSwap(port1, port2).asOutput()
-        
-            new_ioMap[new_is] = new_os
-            
-        return TransitionFunction(devType, new_ioMap)
+        dt = tf.deviceType
+        portPerm = list(range(dt.nPorts))
+        portPerm[port1], portPerm[port2] = port2, port1
+        return tf.relabel(dt.portPermutePerm(tuple(portPerm)))
     
     def portRotate(thisTransitionFunction, offset):
     
@@ -235,25 +330,17 @@ class TransitionFunction:
             offset (an integer)."""
 
         tf = thisTransitionFunction
-
-        devType = tf.deviceType
-        ioMap = tf.ioMap
-        
-        new_ioMap = dict()
-        
-        for (inputSyndrome, outputSyndrome) in ioMap.items():
-        
-            new_is = inputSyndrome.portRotate(offset).asInput()
-            new_os = outputSyndrome.portRotate(offset).asOutput()
-        
-            new_ioMap[new_is] = new_os
-            
-        return TransitionFunction(devType, new_ioMap)
+        dt = tf.deviceType
+        nPorts = dt.nPorts
+        portPerm = tuple((p + offset) % nPorts for p in range(nPorts))
+        return tf.relabel(dt.portPermutePerm(portPerm))
 
     # Instance special methods:
 
-    def __call__(transitionFunction, syndrone):
-        return transitionFunction.applyTo(syndrome)
+    def __call__(transitionFunction, syndrome):
+            # Same as .applyTo(), inlined.
+        dt = transitionFunction._deviceType
+        return dt.outputSyndrome(transitionFunction.perm[dt.syndromeIndex(syndrome)])
 
     def __str__(transitionFunction):
         string = ""
@@ -262,7 +349,10 @@ class TransitionFunction:
         return string
     
     def __hash__(transitionFunction):
-        return hash((transitionFunction.deviceType,hashdict(transitionFunction.ioMap)))
+        tf = transitionFunction
+        if tf._hash is None:
+            tf._hash = hash((tf.deviceType, tf.packedPerm))
+        return tf._hash
     
     # Commented this out b/c it's superseded by the later definition anyway
     #def __eq__(thisTransitionFunction, otherTransitionFunction):
@@ -281,15 +371,24 @@ class TransitionFunction:
         
         tf1 = thisTransitionFunction
         tf2 = otherTransitionFunction
+
+        if tf1 is tf2:
+            return True
+        if not isinstance(tf2, TransitionFunction):
+            return NotImplemented
+
+            # First do some cheap checks that usually suffice to tell
+            # unequal transition functions apart.
+        if not (tf1._deviceType is tf2._deviceType or
+                tf1._deviceType == tf2._deviceType):
+            return False
+        if hash(tf1) != hash(tf2):
+            return False
         
             # Two transition functions compare equal if and only if
-            # they map each input syndrome to the same output syndrome.
-            # (Note this also implies that the device types match too.)
-        for (in_syn, out_syn) in tf1.ioMap.items():
-            if not tf2.ioMap[in_syn] == out_syn:
-                return False
-                
-        return True
+            # they map each input syndrome to the same output syndrome,
+            # i.e., iff their permutations of syndrome indices are equal.
+        return tf1.packedPerm == tf2.packedPerm
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file
@@ -11,10 +11,9 @@
 #|                      Reversible Computing using Superconducting             |
 #|                      Elements (ABRC/SE)                                     |
 #|                                                                             |
-#|      IMPORTED BY:    (3) deviceType;                                        |
-#|                      (2) deviceFunction;                                    |
-#|                      (1) pulseAlphabet, pulseType, state, symmetryGroup,    |
-#|                              transitionFunction.                            |
+#|      IMPORTED BY:    (3) barc;                                              |
+#|                      (2) deviceType;                                        |
+#|                      (1) deviceFunction, pulseAlphabet, pulseType, state.   |
 #|      CODE LAYER:     Layer #0 (no custom imports).                          |
 #|                                                                             |
 #|                                                                             |
@@ -41,11 +40,21 @@
 #|                                                                             |
 #|              Assigns a given device function a unique numeric ID.           |
 #|                                                                             |
+#|          assignIDs()                                         [function]     |
+#|                                                                             |
+#|              Assigns a sequence of device functions consecutive             |
+#|              unique numeric IDs.                                            |
+#|                                                                             |
 #|          lookupID()                                          [function]     |
 #|                                                                             |
 #|              Looks up the unique numeric ID for the given device            |
 #|              function.                                                      |
 #|                                                                             |
+#|          lookupDevice()                                      [function]     |
+#|                                                                             |
+#|              Looks up the device function that has the given                |
+#|              numeric ID.                                                    |
+#|                                                                             |
 #|          count()                                             [function]     |
 #|                                                                             |
 #|              Counts the number of items enumerated by an iterable.          |
@@ -53,7 +62,7 @@
 #|          hashdict()                                          [function]     |
 #|                                                                             |
 #|              Returns a hash code for a dictionary (assuming its             |
-#|              key-value pairs can be ordered and are hashable).              |
+#|              keys and values are hashable).                                 |
 #|                                                                             |
 #|          isOdd()                                             [function]     |
 #|                                                                             |
@@ -70,39 +79,41 @@
 
 # Exported names.
 __all__ = [
-        # Classes:
-
-            #'_KeyClass',     
-                # Simple generic class for sort keys.
-                # Not used outside utils module at present.
-
-            #'_Pair',         
-                # Sortable ordered-pair type.
-                # Not used outside utils module at present.
-        
         # Globals:
 
             #'_deviceIDs',    
                 # Maps deviceFunction objects to numeric IDs.
                 # Private; not used outside utils module.
 
+            #'_devicesByID',    
+                # Maps numeric IDs back to deviceFunction objects.
+                # Private; not used outside utils module.
+
         # Functions:
 
             'assignID',
                 # Assigns a device function a unique numeric ID. 
+                # Not currently used by other modules.
+
+            'assignIDs',
+                # Assigns a batch of device functions consecutive IDs.
                 # Used in the main program (top-level module).
 
             'lookupID',     
                 # Look up the unique numeric ID for the given device. 
                 # Used in deviceFunction module.
 
+            'lookupDevice',
+                # Look up the device function with a given numeric ID.
+                # Not currently used by other modules.
+
             'count',        
                 # Counts the number of items in an iterable.
-                # Used at top-level and in pulseAlphabet & symmetryGroup modules.
+                # Used at top-level and in pulseAlphabet module.
 
             'hashdict',
                 # Hashes a dictionary. 
-                # Used by the transitionFunction module.
+                # Not currently used by other modules.
 
             'isOdd',
                 # Returns True on odd numbers.
@@ -115,63 +126,20 @@ __all__ = [
 
 
 # Imports.
-from collections.abc import Iterable    # Used in type hints.
-
-
-    #|==========================================================================
-    #|  Module section 1:  Classes.                     [module code section]
-    #|
-    #|      Note that the following two classes are both private (i.e.,
-    #|      they are only used internally within this module, and are
-    #|      not intended to be exported to other modules.
-    #|
-    #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
-
-class _KeyClass:     # Not used outside utils -- could make it private.
-
-    """Given objects of any class that supports __eq__ and __lt__ 
-        methods, _KeyClass is a "key function" that can 
-        be used e.g. for sorting items of that class."""
-    # USAGE: sorted(objList, key=_KeyClass)
-
-    def __init__(self, obj, *args):
-        self.obj = obj
-    def __lt__(self, other):
-        return self.obj < other.obj
-    def __gt__(self, other):
-        return other.obj < self.obj
-    def __eq__(self, other):
-        return self.obj == other.obj
-    def __le__(self, other):
-        return (self < other) or (self == other)
-    def __ge__(self, other):
-        return (self > other) or (self == other)
-    def __ne__(self, other):
-        return not (self == other)
-
-
-class _Pair:     # Not used outside utils -- could make it private.
-    """A simple ordered-pair type that supports comparison, hashing, and
-        sorting. This is used by the utils.hashdict() function."""
-    def __init__(p, a, b):
-        p.a = a
-        p.b = b
-    def __lt__(p, q):
-        return (p.a < q.a) or ((p.a == q.a) and (p.b < q.b))
-    def __eq__(p, q):
-        return p.a == q.a
-    def __hash__(p):
-        return hash((p.a, p.b))
+from collections        import  deque   # Used in count().
+from collections.abc    import  Iterable    # Used in type hints.
+from itertools          import  count as _counter   # Used in count().
 
 
     #|==========================================================================
-    #|  Module section 2:  Globals.                     [module code section]
+    #|  Module section 1:  Globals.                     [module code section]
     #|
-    #|      Note that the only global variable defined here (_deviceIDs)
-    #|      is private in that it is only used within this module and is
-    #|      not intended to be exported to other modules.  It should be
-    #|      accessed by other modules only through the public functions
-    #|      assignID() and lookupID(), defined below.
+    #|      Note that the global variables defined here (_deviceIDs and
+    #|      _devicesByID) are private in that they are only used within
+    #|      this module and are not intended to be exported to other 
+    #|      modules.  They should be accessed by other modules only through
+    #|      the public functions assignID(), assignIDs(), lookupID() and
+    #|      lookupDevice(), defined below.
     #|
     #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
@@ -180,17 +148,24 @@ _deviceIDs = dict()
     # This is a map from distinct deviceFunction objects to numeric IDs.
     # Initially it is empty. Use assignID() to populate it.
 
+global _devicesByID     # Maps numeric IDs to deviceFunction objects. Private.
+_devicesByID = list()
+    # The reverse of the above map. IDs are small integers assigned more
+    # or less consecutively, so this is just a list indexed by ID, with
+    # None in any slots whose IDs haven't been assigned.
+
 
     #|==========================================================================
-    #|  Module section 3: Functions.                    [module code section]
+    #|  Module section 2: Functions.                    [module code section]
     #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
         #|~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        #|  assignID(), lookupID()                  [module public functions]
+        #|  assignID(), assignIDs(), lookupID(),    [module public functions]
+        #|  lookupDevice()
         #|
-        #|      These two functions are for working with the global map
+        #|      These functions are for working with the global map
         #|      from distinct deviceFunction objects to their corresponding 
-        #|      unique numeric IDs.
+        #|      unique numeric IDs (and back).
         #|
         #|      Note that this map has to be managed as a hash table rather
         #|      than as an instance attribute of DeviceFunction, since
@@ -198,17 +173,55 @@ _deviceIDs = dict()
         #|      ways; the unique IDs allow us to recognize them as long as 
         #|      we have seen them before.
         #|
+        #|      The maps are bound to the functions as default values of
+        #|      private trailing arguments (which callers should never 
+        #|      pass), so that the functions reach them as fast locals,
+        #|      rather than looking them up as globals on every call.
+        #|      (This is fine since the maps are only ever modified in
+        #|      place, never rebound.)
+        #|
         #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
-def assignID(device,id):
+def assignID(device, id, _deviceIDs=_deviceIDs, _devicesByID=_devicesByID):
     """Given a deviceFunction object <device>, assigns it the unique
         numeric identifier <id>."""
-    _deviceIDs[hash(device)] = id
+    # Key on the device itself (not its hash code), so that the dict
+    # only hashes it once, and two different devices whose hash codes
+    # happen to collide can't overwrite each other's IDs.
+    _deviceIDs[device] = id
+
+    # Grow the reverse map as needed to have a slot for this ID.
+    if id >= len(_devicesByID):
+        _devicesByID.extend([None] * (id + 1 - len(_devicesByID)))
+    _devicesByID[id] = device
+    
+def assignIDs(devices, firstID=1,
+              _deviceIDs=_deviceIDs, _devicesByID=_devicesByID):
+    """Given an iterable of deviceFunction objects <devices>, assigns
+        them the consecutive unique numeric identifiers <firstID>,
+        <firstID>+1, <firstID>+2, etc., in order. This is equivalent to
+        calling assignID() on each of them, but does the updates to the
+        maps as bulk operations."""
+    devices = list(devices)
+    _deviceIDs.update(zip(devices, _counter(firstID)))
+
+    # Make sure the reverse map extends at least to the start of the
+    # new IDs, then write them all in as a single slice.
+    if firstID > len(_devicesByID):
+        _devicesByID.extend([None] * (firstID - len(_devicesByID)))
+    _devicesByID[firstID : firstID + len(devices)] = devices
     
-def lookupID(device):
+def lookupID(device, _deviceIDs=_deviceIDs):
     """Given a deviceFunction object <device>, looks up and returns its
         unique numeric identifier."""
-    return _deviceIDs[hash(device)]
+    return _deviceIDs[device]
+
+def lookupDevice(id, _devicesByID=_devicesByID):
+    """Given a numeric identifier <id>, returns the deviceFunction object
+        that was assigned that identifier (or None if there isn't one)."""
+    if 0 <= id < len(_devicesByID):
+        return _devicesByID[id]
+    return None
 
 
         #|~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -222,13 +235,21 @@ def lookupID(device):
 
 def count(iterable:Iterable) -> int:
     """Counts the number of items in the given iterable."""
-    # The below implementation is more verbose, but slightly faster than 
-    # just doing sum(1 for f in iterable).
-    count = 0
-    if iterable is not None:
-        for item in iterable:
-            count += 1
-    return count
+    if iterable is None:
+        return 0
+    # If it already knows its own length (lists, tuples, dicts, etc.),
+    # just ask it.
+    try:
+        return len(iterable)
+    except TypeError:
+        pass
+    # Otherwise, pair each item with the next number from a counter, and feed the
+    # pairs to a zero-length deque, which just throws them away. This
+    # does the whole loop in C, unlike a for loop or sum(1 for ...);
+    # afterwards, the counter's next number is the number of items.
+    counter = _counter()
+    deque(zip(iterable, counter), maxlen=0)
+    return next(counter)
 
 
         #|~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -248,47 +269,46 @@ def count(iterable:Iterable) -> int:
 def flux(chrOrInt):
     """Returns the flux value of the given (character or integer) symbol."""
 
-    # Assume named states have zero net internal flux.
-    if type(chrOrInt) == str:
-        return 0
-    
+    # Look up the type just once, and compare types by identity.
+    symType = type(chrOrInt)
+
     # Assume states that are integers have that as their net internal flux.
-    if type(chrOrInt) == int:
+    # (Check this case first, since it's the usual one.)
+    if symType is int:
         return chrOrInt
 
+    # Assume named states have zero net internal flux.
+    if symType is str:
+        return 0
+
     # Other cases return None (we don't know how to handle them.)
 
 
         #|~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #|  hashdict()                              [module public function]
         #|
-        #|      Given a dictionary of items that can be put into a canon-
-        #|      ical order and hashed, returns a hash for the entire dic-
-        #|      tionary. The items must support the <, ==, and hash() 
-        #|      operations.
+        #|      Given a dictionary whose keys and values can be hashed,
+        #|      returns a hash for the entire dictionary. Equal diction-
+        #|      aries get equal hashes, regardless of insertion order.
         #|
         #|vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 
 def hashdict(dict):
     """Hashes a dictionary, so long as both the keys and values
-        support < and == comparisons and are hashable."""
-    
-    # Get an iterable view on the items in the dictionary.
-    items = dict.items()
+        are hashable."""
     
-    # Define a function-local helper function to generate 
-    # the dictionary items in the form of sortable pairs.
-    def genItems():
-        for (key,val) in items:
-            yield _Pair(key,val)
-    
-    # Get a sortable list of all ordered pairs in the dictionary.
-    itemList = list(genItems())
+    # Fast paths for the smallest dictionaries, which don't need a set
+    # built at all. (Equal dictionaries have equal sizes, so they still
+    # always get equal hashes.)
+    size = len(dict)
+    if size == 0:
+        return 0
+    if size == 1:
+        return hash(next(iter(dict.items())))
 
-    # Now sort the list, using our helpful generic key class.
-    itemList = sorted(itemList, key=_KeyClass)
-    itemTup = tuple(itemList)
-    return hash(itemTup)
+    # A frozenset's hash doesn't depend on the order of its elements,
+    # so we don't need to sort the items into a canonical order first.
+    return hash(frozenset(dict.items()))
 
 
         #|~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -300,7 +320,7 @@ def hashdict(dict):
 
 def isOdd(num:int) -> bool:
     """Boolean; returns True iff the number given is odd."""
-    return (num % 2) == 1
+    return (num & 1) == 1      # Test the low bit; cheaper than num % 2.
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%% BOTTOM OF FILE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
\ No newline at end of file